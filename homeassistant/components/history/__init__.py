@@ -2,10 +2,11 @@
 from collections import defaultdict
 from datetime import timedelta
 from itertools import groupby
+import json
 import logging
 import time
 
-from sqlalchemy import and_, func
+from sqlalchemy import and_, case, func
 import voluptuous as vol
 
 from homeassistant.components import recorder
@@ -42,6 +43,10 @@ CONFIG_SCHEMA = vol.Schema(
 SIGNIFICANT_DOMAINS = ("climate", "device_tracker", "thermostat", "water_heater")
 IGNORE_DOMAINS = ("zone", "scene")
 
+# How the attributes checked by the history are serialized in the database
+CAN_CANCEL_JSON = '%"can_cancel": true%'
+HIDDEN_JSON = f'%"{ATTR_HIDDEN}": true%'
+
 
 def get_significant_states(
     hass,
@@ -62,24 +67,14 @@ def get_significant_states(
     timer_start = time.perf_counter()
 
     with session_scope(hass=hass) as session:
-        if significant_changes_only:
-            query = session.query(States).filter(
-                (
-                    States.domain.in_(SIGNIFICANT_DOMAINS)
-                    | (States.last_changed == States.last_updated)
-                )
-                & (States.last_updated > start_time)
-            )
-        else:
-            query = session.query(States).filter(States.last_updated > start_time)
-
-        if filters:
-            query = filters.apply(query, entity_ids)
-
-        if end_time is not None:
-            query = query.filter(States.last_updated < end_time)
-
-        query = query.order_by(States.last_updated)
+        query = _significant_states_query(
+            session.query(States),
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+        )
 
         states = (
             state
@@ -96,6 +91,144 @@ def get_significant_states(
     )
 
 
+def get_significant_states_columnar(
+    hass,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+):
+    """Return significant state changes during a period as columns per entity.
+
+    Same selection as get_significant_states, but only the state and the
+    time of the change are loaded, without creating State objects. The
+    attributes of every change are only loaded for SIGNIFICANT_DOMAINS as
+    their graphs are drawn from them:
+
+    {'sensor.x': {'attributes': {...}, 'state': [...], 'last_changed': [...]},
+     'climate.y': {'attributes': {...}, 'state': [...], 'last_changed': [...],
+                   'last_updated': [...], 'attributes_history': [...]}}
+
+    The attributes of an entity are the current attributes, or the ones at
+    start time if the entity no longer exists. Times are POSIX timestamps.
+    """
+    timer_start = time.perf_counter()
+
+    result = {}
+    # Set all entity IDs in the result to maintain the order
+    if entity_ids is not None:
+        for ent_id in entity_ids:
+            result[ent_id] = None
+
+    def append(entity_id, domain, state, last_changed, last_updated, attributes):
+        """Append a state to the columns of an entity."""
+        columns = result.get(entity_id)
+        if columns is None:
+            columns = result[entity_id] = {"state": [], "last_changed": []}
+            if domain in SIGNIFICANT_DOMAINS:
+                columns["last_updated"] = []
+                columns["attributes_history"] = []
+        columns["state"].append(state)
+        columns["last_changed"].append(last_changed)
+        if domain in SIGNIFICANT_DOMAINS:
+            columns["last_updated"].append(last_updated)
+            columns["attributes_history"].append(attributes)
+
+    start_attributes = {}
+    if include_start_time_state:
+        start_timestamp = start_time.timestamp()
+        for state in get_states(hass, start_time, entity_ids, filters=filters):
+            start_attributes[state.entity_id] = dict(state.attributes)
+            append(
+                state.entity_id,
+                state.domain,
+                state.state,
+                start_timestamp,
+                start_timestamp,
+                dict(state.attributes),
+            )
+
+    with session_scope(hass=hass) as session:
+        query = session.query(
+            States.entity_id,
+            States.domain,
+            States.state,
+            States.last_changed,
+            States.last_updated,
+            case(
+                [(States.domain.in_(SIGNIFICANT_DOMAINS), States.attributes)],
+                else_=None,
+            ),
+        ).filter(
+            # Same as _is_significant and the hidden check, without
+            # loading the attributes
+            ((States.domain != "script") | States.attributes.like(CAN_CANCEL_JSON))
+            & ~States.attributes.like(HIDDEN_JSON)
+        )
+        query = _significant_states_query(
+            query, start_time, end_time, entity_ids, filters, significant_changes_only
+        )
+
+        for entity_id, domain, state, last_changed, last_updated, attributes in query:
+            append(
+                entity_id,
+                domain,
+                state,
+                _timestamp(last_changed),
+                _timestamp(last_updated),
+                None if attributes is None else json.loads(attributes),
+            )
+
+    # Filter out the entities that had no results.
+    result = {key: val for key, val in result.items() if val is not None}
+
+    for entity_id, columns in result.items():
+        current = hass.states.get(entity_id)
+        if current is not None:
+            columns["attributes"] = dict(current.attributes)
+        else:
+            columns["attributes"] = start_attributes.get(entity_id, {})
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states_columnar took %fs", elapsed)
+
+    return result
+
+
+def _significant_states_query(
+    query, start_time, end_time, entity_ids, filters, significant_changes_only
+):
+    """Filter a states query on the significant changes during a period."""
+    if significant_changes_only:
+        query = query.filter(
+            (
+                States.domain.in_(SIGNIFICANT_DOMAINS)
+                | (States.last_changed == States.last_updated)
+            )
+            & (States.last_updated > start_time)
+        )
+    else:
+        query = query.filter(States.last_updated > start_time)
+
+    if filters:
+        query = filters.apply(query, entity_ids)
+
+    if end_time is not None:
+        query = query.filter(States.last_updated < end_time)
+
+    return query.order_by(States.last_updated)
+
+
+def _timestamp(value):
+    """Return the POSIX timestamp of a datetime read from the database."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt_util.UTC)
+    return value.timestamp()
+
+
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
 
@@ -335,6 +468,16 @@ class HistoryPeriodView(HomeAssistantView):
 
         hass = request.app["hass"]
 
+        if "columnar" in request.query:
+            return await self._async_get_columnar(
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+            )
+
         result = await hass.async_add_job(
             get_significant_states,
             hass,
@@ -365,6 +508,40 @@ class HistoryPeriodView(HomeAssistantView):
 
         return await hass.async_add_job(self.json, result)
 
+    async def _async_get_columnar(
+        self,
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+    ):
+        """Return the history of the entities as columns."""
+        result = await hass.async_add_job(
+            get_significant_states_columnar,
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            self.filters,
+            include_start_time_state,
+            significant_changes_only,
+        )
+
+        # Optionally reorder the result to respect the ordering given
+        # by any entities explicitly included in the configuration.
+        if self.use_include_order:
+            sorted_result = {
+                entity_id: result.pop(entity_id)
+                for entity_id in self.filters.included_entities
+                if entity_id in result
+            }
+            sorted_result.update(result)
+            result = sorted_result
+
+        return await hass.async_add_job(self.json, result)
+
 
 class Filters:
     """Container for the configured include and exclude filters."""
@@ -1,5 +1,6 @@
 """Support for MQTT message handling."""
 import asyncio
+from collections import deque
 from functools import partial, wraps
 import inspect
 from itertools import groupby
@@ -9,8 +10,9 @@ from operator import attrgetter
 import os
 import ssl
 import sys
+import threading
 import time
-from typing import Any, Callable, List, Optional, Union
+from typing import Any, Callable, Deque, List, Optional, Tuple, Union
 
 import attr
 import requests.certs
@@ -82,6 +84,8 @@ CONF_CLIENT_KEY = "client_key"
 CONF_CLIENT_CERT = "client_cert"
 CONF_TLS_INSECURE = "tls_insecure"
 CONF_TLS_VERSION = "tls_version"
+CONF_MESSAGE_BATCH_SIZE = "message_batch_size"
+CONF_MESSAGE_BATCH_LATENCY = "message_batch_latency"
 
 CONF_BIRTH_MESSAGE = "birth_message"
 CONF_WILL_MESSAGE = "will_message"
@@ -114,6 +118,8 @@ DEFAULT_DISCOVERY_PREFIX = "homeassistant"
 DEFAULT_TLS_PROTOCOL = "auto"
 DEFAULT_PAYLOAD_AVAILABLE = "online"
 DEFAULT_PAYLOAD_NOT_AVAILABLE = "offline"
+DEFAULT_MESSAGE_BATCH_SIZE = 100
+DEFAULT_MESSAGE_BATCH_LATENCY = 0
 
 ATTR_TOPIC = "topic"
 ATTR_PAYLOAD = "payload"
@@ -251,6 +257,12 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Optional(CONF_WILL_MESSAGE): MQTT_WILL_BIRTH_SCHEMA,
                 vol.Optional(CONF_BIRTH_MESSAGE): MQTT_WILL_BIRTH_SCHEMA,
                 vol.Optional(CONF_DISCOVERY, default=DEFAULT_DISCOVERY): cv.boolean,
+                vol.Optional(
+                    CONF_MESSAGE_BATCH_SIZE, default=DEFAULT_MESSAGE_BATCH_SIZE
+                ): cv.positive_int,
+                vol.Optional(
+                    CONF_MESSAGE_BATCH_LATENCY, default=DEFAULT_MESSAGE_BATCH_LATENCY
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
                 # discovery_prefix must be a valid publish topic because if no
                 # state topic is specified, it will be created with the given prefix.
                 vol.Optional(
@@ -515,6 +527,7 @@ async def async_setup(hass: HomeAssistantType, config: ConfigType) -> bool:
     websocket_api.async_register_command(hass, websocket_subscribe)
     websocket_api.async_register_command(hass, websocket_remove_device)
     websocket_api.async_register_command(hass, websocket_mqtt_info)
+    websocket_api.async_register_command(hass, websocket_message_stats)
 
     if conf is None:
         # If we have a config entry, setup is done by that config entry.
@@ -647,6 +660,8 @@ async def async_setup_entry(hass, entry):
         will_message=will_message,
         birth_message=birth_message,
         tls_version=tls_version,
+        message_batch_size=conf[CONF_MESSAGE_BATCH_SIZE],
+        message_batch_latency=conf[CONF_MESSAGE_BATCH_LATENCY],
     )
 
     result: str = await hass.data[DATA_MQTT].async_connect()
@@ -741,6 +756,53 @@ class Subscription:
     encoding = attr.ib(type=str, default="utf-8")
 
 
+@attr.s(slots=True)
+class MessageStats:
+    """Class to hold counters about received messages and their batches."""
+
+    messages = attr.ib(type=int, default=0)
+    batches = attr.ib(type=int, default=0)
+    last_batch_size = attr.ib(type=int, default=0)
+    max_batch_size = attr.ib(type=int, default=0)
+    last_queue_delay = attr.ib(type=float, default=0)
+    max_queue_delay = attr.ib(type=float, default=0)
+    messages_per_second = attr.ib(type=float, default=0)
+    _rate_start = attr.ib(type=Optional[float], default=None)
+    _rate_messages = attr.ib(type=int, default=0)
+
+    def record_batch(self, batch_size: int, queue_delay: float, now: float) -> None:
+        """Record a batch of messages handed over to the event loop."""
+        self.messages += batch_size
+        self.batches += 1
+        self.last_batch_size = batch_size
+        self.max_batch_size = max(self.max_batch_size, batch_size)
+        self.last_queue_delay = queue_delay
+        self.max_queue_delay = max(self.max_queue_delay, queue_delay)
+
+        if self._rate_start is None:
+            self._rate_start = now
+
+        self._rate_messages += batch_size
+        elapsed = now - self._rate_start
+
+        if elapsed >= 1:
+            self.messages_per_second = self._rate_messages / elapsed
+            self._rate_start = now
+            self._rate_messages = 0
+
+    def as_dict(self) -> dict:
+        """Return the counters as a dictionary."""
+        return {
+            "messages": self.messages,
+            "batches": self.batches,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_size,
+            "last_queue_delay": self.last_queue_delay,
+            "max_queue_delay": self.max_queue_delay,
+            "messages_per_second": self.messages_per_second,
+        }
+
+
 class MQTT:
     """Home Assistant MQTT client."""
 
@@ -761,22 +823,34 @@ class MQTT:
         will_message: Optional[Message],
         birth_message: Optional[Message],
         tls_version: Optional[int],
+        message_batch_size: int = DEFAULT_MESSAGE_BATCH_SIZE,
+        message_batch_latency: float = DEFAULT_MESSAGE_BATCH_LATENCY,
     ) -> None:
         """Initialize Home Assistant MQTT client."""
         # We don't import them on the top because some integrations
         # should be able to optionally rely on MQTT.
         # pylint: disable=import-outside-toplevel
         import paho.mqtt.client as mqtt
+        from paho.mqtt.matcher import MQTTMatcher
 
         self.hass = hass
         self.broker = broker
         self.port = port
         self.keepalive = keepalive
         self.subscriptions: List[Subscription] = []
+        # Topic trie mapping each subscribed topic filter to its subscriptions
+        self._matcher = MQTTMatcher()
         self.birth_message = birth_message
         self.connected = False
         self._mqttc: mqtt.Client = None
         self._paho_lock = asyncio.Lock()
+        # Messages received by the paho thread, waiting to be handled in the loop
+        self._message_batch_size = message_batch_size
+        self._message_batch_latency = message_batch_latency
+        self._pending_messages: Deque[Tuple[float, Any]] = deque()
+        self._pending_lock = threading.Lock()
+        self._drain_scheduled = False
+        self.message_stats = MessageStats()
 
         if protocol == PROTOCOL_31:
             proto: int = mqtt.MQTTv31
@@ -872,6 +946,11 @@ class MQTT:
         subscription = Subscription(topic, msg_callback, qos, encoding)
         self.subscriptions.append(subscription)
 
+        try:
+            self._matcher[topic].append(subscription)
+        except KeyError:
+            self._matcher[topic] = [subscription]
+
         await self._async_perform_subscription(topic, qos)
 
         @callback
@@ -881,10 +960,15 @@ class MQTT:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
 
-            if any(other.topic == topic for other in self.subscriptions):
+            topic_subscriptions = self._matcher[topic]
+            topic_subscriptions.remove(subscription)
+
+            if topic_subscriptions:
                 # Other subscriptions on topic remaining - don't unsubscribe.
                 return
 
+            del self._matcher[topic]
+
             # Only unsubscribe if currently connected.
             if self.connected:
                 self.hass.async_create_task(self._async_unsubscribe(topic))
@@ -951,8 +1035,67 @@ class MQTT:
             )
 
     def _mqtt_on_message(self, _mqttc, _userdata, msg) -> None:
-        """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        """Message received callback.
+
+        Messages are buffered and handed over to the event loop in batches, so
+        only the first message of a batch has to wake up the loop.
+        """
+        with self._pending_lock:
+            self._pending_messages.append((time.monotonic(), msg))
+
+            if self._drain_scheduled:
+                return
+
+            self._drain_scheduled = True
+
+        self.hass.loop.call_soon_threadsafe(self._async_schedule_drain)
+
+    @callback
+    def _async_schedule_drain(self) -> None:
+        """Schedule handling the buffered messages.
+
+        Wait up to the batch latency for more messages, unless a full batch is
+        already waiting.
+        """
+        if (
+            self._message_batch_latency
+            and len(self._pending_messages) < self._message_batch_size
+        ):
+            self.hass.loop.call_later(
+                self._message_batch_latency, self._async_drain_messages
+            )
+        else:
+            self._async_drain_messages()
+
+    @callback
+    def _async_drain_messages(self) -> None:
+        """Handle a batch of buffered messages."""
+        with self._pending_lock:
+            batch = [
+                self._pending_messages.popleft()
+                for _ in range(
+                    min(len(self._pending_messages), self._message_batch_size)
+                )
+            ]
+            more_pending = bool(self._pending_messages)
+
+            if not more_pending:
+                self._drain_scheduled = False
+
+        now = time.monotonic()
+
+        if batch:
+            self.message_stats.record_batch(len(batch), now - batch[0][0], now)
+
+        for _, msg in batch:
+            try:
+                self._mqtt_handle_message(msg)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error handling message on %s", msg.topic)
+
+        if more_pending:
+            # Let the loop run other work before handling the next batch
+            self.hass.loop.call_soon(self._async_drain_messages)
 
     @callback
     def _mqtt_handle_message(self, msg) -> None:
@@ -963,10 +1106,14 @@ class MQTT:
             msg.payload,
         )
 
-        for subscription in self.subscriptions:
-            if not _match_topic(subscription.topic, msg.topic):
-                continue
+        # Collect the matches first, callbacks may change the subscriptions
+        subscriptions = [
+            subscription
+            for topic_subscriptions in self._matcher.iter_match(msg.topic)
+            for subscription in topic_subscriptions
+        ]
 
+        for subscription in subscriptions:
             payload: SubscribePayloadType = msg.payload
             if subscription.encoding is not None:
                 try:
@@ -1027,20 +1174,6 @@ def _raise_on_error(result_code: int) -> None:
         )
 
 
-def _match_topic(subscription: str, topic: str) -> bool:
-    """Test if topic matches subscription."""
-    # pylint: disable=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-    try:
-        next(matcher.iter_match(topic))
-        return True
-    except StopIteration:
-        return False
-
-
 class MqttAttributes(Entity):
     """Mixin used for platforms that support JSON attributes."""
 
@@ -1337,6 +1470,14 @@ async def websocket_mqtt_info(hass, connection, msg):
     connection.send_result(msg["id"], mqtt_info)
 
 
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required("type"): "mqtt/message_stats"})
+@callback
+def websocket_message_stats(hass, connection, msg):
+    """Get counters about received MQTT messages."""
+    connection.send_result(msg["id"], hass.data[DATA_MQTT].message_stats.as_dict())
+
+
 @websocket_api.websocket_command(
     {vol.Required("type"): "mqtt/device/remove", vol.Required("device_id"): str}
 )
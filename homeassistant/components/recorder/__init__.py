@@ -9,6 +9,7 @@ import threading
 import time
 from typing import Any, Dict, Optional
 
+import attr
 from sqlalchemy import create_engine, exc, select
 from sqlalchemy.engine import Engine
 from sqlalchemy.event import listens_for
@@ -16,7 +17,7 @@ from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.pool import StaticPool
 import voluptuous as vol
 
-from homeassistant.components import persistent_notification
+from homeassistant.components import persistent_notification, websocket_api
 from homeassistant.const import (
     ATTR_ENTITY_ID,
     CONF_DOMAINS,
@@ -29,7 +30,7 @@ from homeassistant.const import (
     EVENT_TIME_CHANGED,
     MATCH_ALL,
 )
-from homeassistant.core import CoreState, HomeAssistant, callback
+from homeassistant.core import CoreState, Event, HomeAssistant, callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import generate_filter
 from homeassistant.helpers.typing import ConfigType
@@ -61,6 +62,7 @@ DEFAULT_DB_FILE = "home-assistant_v2.db"
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 KEEPALIVE_TIME = 30
+MAX_BATCH_SIZE = 1000
 
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
@@ -69,6 +71,11 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_QUEUE_MAX_SIZE = "queue_max_size"
+CONF_QUEUE_OVERFLOW = "queue_overflow"
+
+OVERFLOW_COALESCE = "coalesce"
+OVERFLOW_DROP = "drop"
 
 FILTER_SCHEMA = vol.Schema(
     {
@@ -108,6 +115,10 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Optional(
                     CONF_DB_RETRY_WAIT, default=DEFAULT_DB_RETRY_WAIT
                 ): cv.positive_int,
+                vol.Optional(CONF_QUEUE_MAX_SIZE, default=0): cv.positive_int,
+                vol.Optional(CONF_QUEUE_OVERFLOW, default=OVERFLOW_COALESCE): vol.In(
+                    [OVERFLOW_COALESCE, OVERFLOW_DROP]
+                ),
             }
         )
     },
@@ -148,6 +159,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     commit_interval = conf[CONF_COMMIT_INTERVAL]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
+    queue_max_size = conf[CONF_QUEUE_MAX_SIZE]
+    queue_overflow = conf[CONF_QUEUE_OVERFLOW]
 
     db_url = conf.get(CONF_DB_URL)
     if not db_url:
@@ -165,6 +178,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         include=include,
         exclude=exclude,
+        queue_max_size=queue_max_size,
+        queue_overflow=queue_overflow,
     )
     instance.async_initialize()
     instance.start()
@@ -177,12 +192,56 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         DOMAIN, SERVICE_PURGE, async_handle_purge_service, schema=SERVICE_PURGE_SCHEMA
     )
 
+    websocket_api.async_register_command(hass, websocket_queue_stats)
+
     return await instance.async_db_ready
 
 
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required("type"): "recorder/queue_stats"})
+@callback
+def websocket_queue_stats(hass, connection, msg):
+    """Get counters about the recorder queue."""
+    instance = hass.data[DATA_INSTANCE]
+    connection.send_result(
+        msg["id"], instance.queue_stats.as_dict(instance.queue.qsize())
+    )
+
+
 PurgeTask = namedtuple("PurgeTask", ["keep_days", "repack"])
 
 
+@attr.s(slots=True)
+class QueueStats:
+    """Class to hold counters about the recorder queue."""
+
+    max_queue_size = attr.ib(type=int, default=0)
+    dropped = attr.ib(type=int, default=0)
+    coalesced = attr.ib(type=int, default=0)
+    last_queue_delay = attr.ib(type=float, default=0)
+    max_queue_delay = attr.ib(type=float, default=0)
+
+    def record_queue_size(self, queue_size: int) -> None:
+        """Record the size of the queue after adding an event."""
+        self.max_queue_size = max(self.max_queue_size, queue_size)
+
+    def record_queue_delay(self, queue_delay: float) -> None:
+        """Record how long the oldest event of a batch has been waiting."""
+        self.last_queue_delay = queue_delay
+        self.max_queue_delay = max(self.max_queue_delay, queue_delay)
+
+    def as_dict(self, queue_size: int) -> dict:
+        """Return the counters as a dictionary."""
+        return {
+            "queue_size": queue_size,
+            "max_queue_size": self.max_queue_size,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "last_queue_delay": self.last_queue_delay,
+            "max_queue_delay": self.max_queue_delay,
+        }
+
+
 class Recorder(threading.Thread):
     """A threaded recorder class."""
 
@@ -197,6 +256,8 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         include: Dict,
         exclude: Dict,
+        queue_max_size: int = 0,
+        queue_overflow: str = OVERFLOW_COALESCE,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -206,6 +267,9 @@ class Recorder(threading.Thread):
         self.purge_interval = purge_interval
         self.commit_interval = commit_interval
         self.queue: Any = queue.Queue()
+        self.queue_max_size = queue_max_size
+        self.queue_overflow = queue_overflow
+        self.queue_stats = QueueStats()
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
         self.db_max_retries = db_max_retries
@@ -224,6 +288,9 @@ class Recorder(threading.Thread):
 
         self._timechanges_seen = 0
         self._keepalive_count = 0
+        # State changes that did not fit in the queue, by entity_id
+        self._overflow: Dict[str, Event] = {}
+        self._overflow_lock = threading.Lock()
         self.event_session = None
         self.get_session = None
 
@@ -342,67 +409,136 @@ class Recorder(threading.Thread):
         # with a commit every time the event time
         # has changed.  This reduces the disk io.
         while True:
-            event = self.queue.get()
-            if event is None:
-                self._close_run()
-                self._close_connection()
-                self.queue.task_done()
-                return
-            if isinstance(event, PurgeTask):
-                purge.purge_old_data(self, event.keep_days, event.repack)
-                self.queue.task_done()
-                continue
-            if event.event_type == EVENT_TIME_CHANGED:
-                self.queue.task_done()
-                self._keepalive_count += 1
-                if self._keepalive_count >= KEEPALIVE_TIME:
-                    self._keepalive_count = 0
-                    self._send_keep_alive()
-                if self.commit_interval:
-                    self._timechanges_seen += 1
-                    if self._timechanges_seen >= self.commit_interval:
-                        self._timechanges_seen = 0
-                        self._commit_event_session_or_retry()
-                continue
-            if event.event_type in self.exclude_t:
-                self.queue.task_done()
-                continue
-
-            entity_id = event.data.get(ATTR_ENTITY_ID)
-            if entity_id is not None:
-                if not self.entity_filter(entity_id):
+            pending = []
+            batch = self._dequeue_batch()
+            self._requeue_overflow()
+            for event in batch:
+                if (
+                    event is None
+                    or isinstance(event, PurgeTask)
+                    or event.event_type == EVENT_TIME_CHANGED
+                ):
+                    # Write what we have so far before handling the task
+                    self._write_events(pending)
+                    pending = []
+                if event is None:
+                    self._close_run()
+                    self._close_connection()
+                    self.queue.task_done()
+                    return
+                if isinstance(event, PurgeTask):
+                    # Continue the purge after the events queued in the meantime
+                    if not purge.purge_old_data(self, event.keep_days, event.repack):
+                        self.queue.put(event)
+                    self.queue.task_done()
+                    continue
+                if event.event_type == EVENT_TIME_CHANGED:
+                    self.queue.task_done()
+                    self._keepalive_count += 1
+                    if self._keepalive_count >= KEEPALIVE_TIME:
+                        self._keepalive_count = 0
+                        self._send_keep_alive()
+                    if self.commit_interval:
+                        self._timechanges_seen += 1
+                        if self._timechanges_seen >= self.commit_interval:
+                            self._timechanges_seen = 0
+                            self._commit_event_session_or_retry()
+                    continue
+                if event.event_type in self.exclude_t:
                     self.queue.task_done()
                     continue
 
+                entity_id = event.data.get(ATTR_ENTITY_ID)
+                if entity_id is not None:
+                    if not self.entity_filter(entity_id):
+                        self.queue.task_done()
+                        continue
+
+                pending.append(event)
+
+            self._write_events(pending)
+
+    def _dequeue_batch(self):
+        """Wait for the next queued item and drain what is already queued."""
+        batch = [self.queue.get()]
+        while len(batch) < MAX_BATCH_SIZE:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _requeue_overflow(self):
+        """Move coalesced state changes back into the queue if there is room."""
+        if not self._overflow:
+            return
+
+        with self._overflow_lock:
+            room = self.queue_max_size - self.queue.qsize()
+            for entity_id in list(self._overflow)[:room]:
+                self.queue.put(self._overflow.pop(entity_id))
+
+    def _write_events(self, events):
+        """Write a batch of events and their states to the database.
+
+        All events are added to the session and flushed at once to get their
+        event_id, after which the states are inserted in a single executemany.
+        """
+        if not events:
+            return
+
+        self.queue_stats.record_queue_delay(
+            (dt_util.utcnow() - events[0].time_fired).total_seconds()
+        )
+
+        added = []
+        for event in events:
             try:
                 dbevent = Events.from_event(event)
                 self.event_session.add(dbevent)
-                self.event_session.flush()
+                added.append((event, dbevent))
             except (TypeError, ValueError):
                 _LOGGER.warning("Event is not JSON serializable: %s", event)
             except Exception as err:  # pylint: disable=broad-except
                 # Must catch the exception to prevent the loop from collapsing
                 _LOGGER.exception("Error adding event: %s", err)
 
-            if dbevent and event.event_type == EVENT_STATE_CHANGED:
-                try:
-                    dbstate = States.from_event(event)
-                    dbstate.event_id = dbevent.event_id
-                    self.event_session.add(dbstate)
-                except (TypeError, ValueError):
-                    _LOGGER.warning(
-                        "State is not JSON serializable: %s",
-                        event.data.get("new_state"),
-                    )
-                except Exception as err:  # pylint: disable=broad-except
-                    # Must catch the exception to prevent the loop from collapsing
-                    _LOGGER.exception("Error adding state change: %s", err)
+        try:
+            self.event_session.flush()
+        except Exception as err:  # pylint: disable=broad-except
+            # Must catch the exception to prevent the loop from collapsing
+            _LOGGER.exception("Error adding events: %s", err)
+            added = []
 
-            # If they do not have a commit interval
-            # than we commit right away
-            if not self.commit_interval:
-                self._commit_event_session_or_retry()
+        dbstates = []
+        for event, dbevent in added:
+            if event.event_type != EVENT_STATE_CHANGED:
+                continue
+            try:
+                dbstate = States.from_event(event)
+                dbstate.event_id = dbevent.event_id
+                dbstates.append(dbstate)
+            except (TypeError, ValueError):
+                _LOGGER.warning(
+                    "State is not JSON serializable: %s", event.data.get("new_state"),
+                )
+            except Exception as err:  # pylint: disable=broad-except
+                # Must catch the exception to prevent the loop from collapsing
+                _LOGGER.exception("Error adding state change: %s", err)
 
+        if dbstates:
+            try:
+                self.event_session.bulk_save_objects(dbstates)
+            except Exception as err:  # pylint: disable=broad-except
+                # Must catch the exception to prevent the loop from collapsing
+                _LOGGER.exception("Error adding state changes: %s", err)
+
+        # If they do not have a commit interval
+        # than we commit right away
+        if not self.commit_interval:
+            self._commit_event_session_or_retry()
+
+        for _ in events:
             self.queue.task_done()
 
     def _send_keep_alive(self):
@@ -484,7 +620,33 @@ class Recorder(threading.Thread):
     @callback
     def event_listener(self, event):
         """Listen for new events and put them in the process queue."""
-        self.queue.put(event)
+        if not self.queue_max_size:
+            self.queue.put(event)
+            self.queue_stats.record_queue_size(self.queue.qsize())
+            return
+
+        entity_id = None
+        if event.event_type == EVENT_STATE_CHANGED:
+            entity_id = event.data.get(ATTR_ENTITY_ID)
+
+        with self._overflow_lock:
+            # Keep the order of the state changes of an entity
+            if entity_id in self._overflow:
+                self._overflow[entity_id] = event
+                self.queue_stats.coalesced += 1
+                return
+
+            if self.queue.qsize() < self.queue_max_size:
+                self.queue.put(event)
+                self.queue_stats.record_queue_size(self.queue.qsize())
+                return
+
+            # The queue is full, only the latest state of an entity is kept
+            if entity_id is None or self.queue_overflow == OVERFLOW_DROP:
+                self.queue_stats.dropped += 1
+                return
+
+            self._overflow[entity_id] = event
 
     def block_till_done(self):
         """Block till all events processed."""
@@ -1,6 +1,7 @@
 """Purge old data helper."""
 from datetime import timedelta
 import logging
+import time
 
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -11,27 +12,31 @@ from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Maximum number of rows deleted per table before the recorder
+# gets a chance to write the events that are queued in the meantime
+PURGE_BATCH_SIZE = 1000
+
 
 def purge_old_data(instance, purge_days, repack):
-    """Purge events and states older than purge_days ago."""
+    """Purge events and states older than purge_days ago.
+
+    Rows are deleted in batches, each in their own transaction, oldest first.
+    Returns False if there are rows left to purge, in which case the purge
+    should be run again after the queued events have been written.
+    """
     purge_before = dt_util.utcnow() - timedelta(days=purge_days)
     _LOGGER.debug("Purging events before %s", purge_before)
 
     try:
-        with session_scope(session=instance.get_session()) as session:
-            deleted_rows = (
-                session.query(States)
-                .filter(States.last_updated < purge_before)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s states", deleted_rows)
-
-            deleted_rows = (
-                session.query(Events)
-                .filter(Events.time_fired < purge_before)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s events", deleted_rows)
+        if not _purge_batch(
+            instance, States, States.state_id, States.last_updated, purge_before
+        ):
+            return False
+
+        if not _purge_batch(
+            instance, Events, Events.event_id, Events.time_fired, purge_before
+        ):
+            return False
 
         # Execute sqlite vacuum command to free up space on disk
         if repack and instance.engine.driver in ("pysqlite", "postgresql"):
@@ -40,3 +45,39 @@ def purge_old_data(instance, purge_days, repack):
 
     except SQLAlchemyError as err:
         _LOGGER.warning("Error purging history: %s.", err)
+
+    return True
+
+
+def _purge_batch(instance, table, id_column, time_column, purge_before):
+    """Delete the oldest rows of a table, return True if none are left."""
+    start = time.monotonic()
+
+    with session_scope(session=instance.get_session()) as session:
+        # Deleting by primary key range keeps every batch bounded,
+        # the primary key follows the insert order.
+        last_id = (
+            session.query(id_column)
+            .filter(time_column < purge_before)
+            .order_by(id_column)
+            .offset(PURGE_BATCH_SIZE - 1)
+            .limit(1)
+            .scalar()
+        )
+
+        query = session.query(table).filter(time_column < purge_before)
+        if last_id is not None:
+            query = query.filter(id_column <= last_id)
+        deleted_rows = query.delete(synchronize_session=False)
+
+    elapsed = time.monotonic() - start
+    _LOGGER.debug(
+        "Deleted %s %s in %.2fs (%.0f rows/s)%s",
+        deleted_rows,
+        table.__tablename__,
+        elapsed,
+        deleted_rows / elapsed if elapsed else 0,
+        ", continuing" if last_id is not None else "",
+    )
+
+    return last_id is None
@@ -1,9 +1,11 @@
 """Commands part of Websocket API."""
+from typing import Dict, Optional, Tuple
+
 import voluptuous as vol
 
 from homeassistant.auth.permissions.const import POLICY_READ
 from homeassistant.const import EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL
-from homeassistant.core import DOMAIN as HASS_DOMAIN, callback
+from homeassistant.core import DOMAIN as HASS_DOMAIN, State, callback, split_entity_id
 from homeassistant.exceptions import HomeAssistantError, ServiceNotFound, Unauthorized
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.event import async_track_state_change
@@ -18,6 +20,7 @@ from . import const, decorators, messages
 def async_register_commands(hass, async_reg):
     """Register commands."""
     async_reg(hass, handle_subscribe_events)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_unsubscribe_events)
     async_reg(hass, handle_call_service)
     async_reg(hass, handle_get_states)
@@ -63,7 +66,13 @@ def handle_subscribe_events(hass, connection, msg):
             ):
                 return
 
-            connection.send_message(messages.event_message(msg["id"], event))
+            try:
+                message = messages.cached_event_message(msg["id"], event)
+            except (ValueError, TypeError):
+                # Let the writer report the serialization error
+                message = messages.event_message(msg["id"], event)
+
+            connection.send_message(message)
 
     else:
 
@@ -82,6 +91,157 @@ def handle_subscribe_events(hass, connection, msg):
     connection.send_message(messages.result_message(msg["id"]))
 
 
+def _state_diff(old_state, new_state):
+    """Return the fields of new_state that differ from old_state."""
+    if old_state is None:
+        return {
+            "state": new_state.state,
+            "attributes": dict(new_state.attributes),
+            "last_changed": new_state.last_changed,
+        }
+
+    diff = {}
+
+    if new_state.state != old_state.state:
+        diff["state"] = new_state.state
+
+    if new_state.last_changed != old_state.last_changed:
+        diff["last_changed"] = new_state.last_changed
+
+    old_attributes = old_state.attributes
+    changed_attributes = {
+        key: value
+        for key, value in new_state.attributes.items()
+        if key not in old_attributes or old_attributes[key] != value
+    }
+    removed_attributes = [
+        key for key in old_attributes if key not in new_state.attributes
+    ]
+
+    if changed_attributes:
+        diff["attributes"] = changed_attributes
+
+    if removed_attributes:
+        diff["removed_attributes"] = removed_attributes
+
+    return diff
+
+
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Optional("entity_ids"): cv.entity_ids,
+        vol.Optional("domains"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("coalesce_window", default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=60)
+        ),
+    }
+)
+def handle_subscribe_entities(hass, connection, msg):
+    """Handle subscribe entities command.
+
+    Only state changes of the requested entities and domains are forwarded,
+    and only the fields that changed since the last update are sent. Changes
+    of the same entity within the coalesce window are merged into one update.
+
+    Async friendly.
+    """
+    entity_ids = set(msg.get("entity_ids", []))
+    domains = set(msg.get("domains", []))
+    coalesce_window = msg["coalesce_window"]
+
+    if not entity_ids and not domains:
+        connection.send_message(
+            messages.error_message(
+                msg["id"],
+                const.ERR_INVALID_FORMAT,
+                "At least one of entity_ids or domains is required.",
+            )
+        )
+        return
+
+    entity_perm = connection.user.permissions.check_entity
+    # Entity ID -> (state at the last update sent, latest state)
+    pending: Dict[str, Tuple[Optional[State], Optional[State]]] = {}
+    flush_handle = None
+
+    def matches(entity_id):
+        """Return if the subscription covers the entity."""
+        return (
+            entity_id in entity_ids or split_entity_id(entity_id)[0] in domains
+        ) and entity_perm(entity_id, POLICY_READ)
+
+    @callback
+    def flush():
+        """Send the pending changes to the websocket."""
+        nonlocal flush_handle
+        flush_handle = None
+
+        changed = {}
+        removed = []
+
+        for entity_id, (old_state, new_state) in pending.items():
+            if new_state is None:
+                if old_state is not None:
+                    removed.append(entity_id)
+                continue
+
+            diff = _state_diff(old_state, new_state)
+            if diff:
+                changed[entity_id] = diff
+
+        pending.clear()
+
+        if changed or removed:
+            connection.send_message(
+                messages.event_message(
+                    msg["id"], {"changed": changed, "removed": removed}
+                )
+            )
+
+    @callback
+    def forward_state(entity_id, old_state, new_state):
+        """Queue a state change of a subscribed entity."""
+        nonlocal flush_handle
+
+        if not matches(entity_id):
+            return
+
+        if entity_id in pending:
+            pending[entity_id] = (pending[entity_id][0], new_state)
+        else:
+            pending[entity_id] = (old_state, new_state)
+
+        if not coalesce_window:
+            flush()
+        elif flush_handle is None:
+            flush_handle = hass.loop.call_later(coalesce_window, flush)
+
+    if domains:
+        unsub = async_track_state_change(hass, MATCH_ALL, forward_state)
+    else:
+        unsub = async_track_state_change(hass, entity_ids, forward_state)
+
+    @callback
+    def unsubscribe():
+        """Remove the state change listener."""
+        unsub()
+
+        if flush_handle is not None:
+            flush_handle.cancel()
+
+    connection.subscriptions[msg["id"]] = unsubscribe
+    connection.send_message(messages.result_message(msg["id"]))
+
+    # Send the current state of the subscribed entities
+    for state in hass.states.async_all():
+        if matches(state.entity_id):
+            pending[state.entity_id] = (None, state)
+
+    flush()
+
+
 @callback
 @decorators.websocket_command(
     {
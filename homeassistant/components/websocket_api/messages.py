@@ -1,12 +1,26 @@
 """Message templates for websocket commands."""
+from collections import OrderedDict
+from typing import Tuple
 
 import voluptuous as vol
 
+from homeassistant.core import Event
 from homeassistant.helpers import config_validation as cv
 
 from . import const
 
-# mypy: allow-untyped-defs
+# mypy: allow-untyped-calls, allow-untyped-defs
+
+# Placeholder for the message id in cached serialized messages
+IDEN_TEMPLATE = "__IDEN__"
+IDEN_JSON_TEMPLATE = f'"{IDEN_TEMPLATE}"'
+
+# Number of serialized events to keep for fan-out to multiple subscribers
+EVENT_CACHE_SIZE = 128
+
+# Serialized event messages keyed by event identity. The cache holds a
+# reference to the event, so its id can not be reused while it is cached.
+_EVENT_MESSAGE_CACHE: "OrderedDict[int, Tuple[Event, str]]" = OrderedDict()
 
 # Minimal requirements of a message
 MINIMAL_MESSAGE_SCHEMA = vol.Schema(
@@ -36,3 +50,26 @@ def error_message(iden, code, message):
 def event_message(iden, event):
     """Return an event message."""
     return {"id": iden, "type": "event", "event": event}
+
+
+def cached_event_message(iden, event):
+    """Return a serialized event message.
+
+    Each event is serialized once and shared by every subscription that
+    forwards it, only the message id is filled in per subscription.
+    """
+    cached = _EVENT_MESSAGE_CACHE.get(id(event))
+
+    if cached is None or cached[0] is not event:
+        cached = (
+            event,
+            const.JSON_DUMP(event_message(IDEN_TEMPLATE, event)).replace(
+                IDEN_JSON_TEMPLATE, IDEN_TEMPLATE, 1
+            ),
+        )
+        _EVENT_MESSAGE_CACHE[id(event)] = cached
+
+        if len(_EVENT_MESSAGE_CACHE) > EVENT_CACHE_SIZE:
+            _EVENT_MESSAGE_CACHE.popitem(last=False)
+
+    return cached[1].replace(IDEN_TEMPLATE, str(iden), 1)
@@ -710,6 +710,8 @@ class State:
         "last_changed",
         "last_updated",
         "context",
+        "domain",
+        "object_id",
     ]
 
     def __init__(
@@ -745,16 +747,7 @@ class State:
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
-
-    @property
-    def domain(self) -> str:
-        """Domain of this state."""
-        return split_entity_id(self.entity_id)[0]
-
-    @property
-    def object_id(self) -> str:
-        """Object id of this state."""
-        return split_entity_id(self.entity_id)[1]
+        self.domain, _, self.object_id = self.entity_id.partition(".")
 
     @property
     def name(self) -> str:
@@ -844,6 +837,7 @@ class StateMachine:
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
         self._states: Dict[str, State] = {}
+        self._domain_index: Dict[str, Dict[str, State]] = {}
         self._bus = bus
         self._loop = loop
 
@@ -863,27 +857,24 @@ class StateMachine:
         if domain_filter is None:
             return list(self._states.keys())
 
-        domain_filter = domain_filter.lower()
+        return list(self._domain_index.get(domain_filter.lower(), {}))
 
-        return [
-            state.entity_id
-            for state in self._states.values()
-            if state.domain == domain_filter
-        ]
-
-    def all(self) -> List[State]:
+    def all(self, domain_filter: Optional[str] = None) -> List[State]:
         """Create a list of all states."""
         return run_callback_threadsafe(  # type: ignore
-            self._loop, self.async_all
+            self._loop, self.async_all, domain_filter
         ).result()
 
     @callback
-    def async_all(self) -> List[State]:
+    def async_all(self, domain_filter: Optional[str] = None) -> List[State]:
         """Create a list of all states.
 
         This method must be run in the event loop.
         """
-        return list(self._states.values())
+        if domain_filter is None:
+            return list(self._states.values())
+
+        return list(self._domain_index.get(domain_filter.lower(), {}).values())
 
     def get(self, entity_id: str) -> Optional[State]:
         """Retrieve state of entity_id or None if not found.
@@ -923,6 +914,11 @@ class StateMachine:
         if old_state is None:
             return False
 
+        domain_states = self._domain_index[old_state.domain]
+        del domain_states[entity_id]
+        if not domain_states:
+            del self._domain_index[old_state.domain]
+
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": None},
@@ -995,6 +991,7 @@ class StateMachine:
 
         state = State(entity_id, new_state, attributes, last_changed, None, context)
         self._states[entity_id] = state
+        self._domain_index.setdefault(state.domain, {})[entity_id] = state
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": state},
@@ -1,7 +1,10 @@
 """Helpers for listening to events."""
 from datetime import datetime, timedelta
 import functools as ft
-from typing import Any, Callable, Dict, Iterable, Optional, Union, cast
+import heapq
+from itertools import count
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union, cast
 
 import attr
 
@@ -21,6 +24,13 @@ from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
 
+TRACK_STATE_CHANGE_CALLBACKS = "track_state_change_callbacks"
+TRACK_STATE_CHANGE_LISTENER = "track_state_change_listener"
+TRACK_POINT_IN_TIME_SCHEDULER = "track_point_in_time_scheduler"
+TRACK_TIME_PATTERN_SCHEDULER = "track_time_pattern_scheduler"
+
+_LOGGER = logging.getLogger(__name__)
+
 # PyLint does not like the use of threaded_listener_factory
 # pylint: disable=invalid-name
 
@@ -72,7 +82,7 @@ def async_track_state_change(
 
     # Ensure it is a lowercase list with entity ids we want to match on
     if entity_ids == MATCH_ALL:
-        pass
+        entity_ids = (MATCH_ALL,)
     elif isinstance(entity_ids, str):
         entity_ids = (entity_ids.lower(),)
     else:
@@ -81,12 +91,6 @@ def async_track_state_change(
     @callback
     def state_change_listener(event: Event) -> None:
         """Handle specific state changes."""
-        if (
-            entity_ids != MATCH_ALL
-            and cast(str, event.data.get("entity_id")) not in entity_ids
-        ):
-            return
-
         old_state = event.data.get("old_state")
         if old_state is not None:
             old_state = old_state.state
@@ -103,7 +107,69 @@ def async_track_state_change(
                 event.data.get("new_state"),
             )
 
-    return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+    return _async_add_state_change_listener(
+        hass, set(entity_ids), state_change_listener
+    )
+
+
+@callback
+def _async_add_state_change_listener(
+    hass: HomeAssistant, entity_ids: Iterable[str], listener: Callable[[Event], None]
+) -> CALLBACK_TYPE:
+    """Add a listener to the shared per-entity state change index.
+
+    A single state_changed listener is registered on the bus and dispatches
+    each event only to the listeners of the changed entity and to the
+    listeners registered for MATCH_ALL.
+    """
+    entity_callbacks: Dict[str, List[Callable[[Event], None]]] = hass.data.setdefault(
+        TRACK_STATE_CHANGE_CALLBACKS, {}
+    )
+
+    if TRACK_STATE_CHANGE_LISTENER not in hass.data:
+
+        @callback
+        def _async_state_change_dispatcher(event: Event) -> None:
+            """Dispatch state changes by entity_id."""
+            listeners = entity_callbacks.get(cast(str, event.data.get("entity_id")), [])
+            listeners = listeners + entity_callbacks.get(MATCH_ALL, [])
+
+            for entity_listener in listeners:
+                try:
+                    entity_listener(event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Error while processing state changed for %s",
+                        event.data.get("entity_id"),
+                    )
+
+        hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, _async_state_change_dispatcher
+        )
+
+    entity_ids = tuple(entity_ids)
+    for entity_id in entity_ids:
+        entity_callbacks.setdefault(entity_id, []).append(listener)
+
+    @callback
+    def remove_listener() -> None:
+        """Remove state change listener."""
+        for entity_id in entity_ids:
+            try:
+                entity_callbacks[entity_id].remove(listener)
+            except (KeyError, ValueError):
+                # KeyError if no listener is registered for the entity
+                # ValueError if listener was already removed
+                _LOGGER.warning("Unable to remove unknown listener %s", listener)
+                continue
+
+            if not entity_callbacks[entity_id]:
+                del entity_callbacks[entity_id]
+
+        if not entity_callbacks and TRACK_STATE_CHANGE_LISTENER in hass.data:
+            hass.data.pop(TRACK_STATE_CHANGE_LISTENER)()
+
+    return remove_listener
 
 
 track_state_change = threaded_listener_factory(async_track_state_change)
@@ -222,36 +288,121 @@ def async_track_point_in_time(
 track_point_in_time = threaded_listener_factory(async_track_point_in_time)
 
 
-@callback
-@bind_hass
-def async_track_point_in_utc_time(
-    hass: HomeAssistant, action: Callable[..., Any], point_in_time: datetime
-) -> CALLBACK_TYPE:
-    """Add a listener that fires once after a specific point in UTC time."""
-    # Ensure point_in_time is UTC
-    point_in_time = dt_util.as_utc(point_in_time)
+@attr.s(slots=True)
+class _PointInTimeTimer:
+    """A pending point in time listener."""
+
+    action: Callable[..., Any] = attr.ib()
+    cancelled: bool = attr.ib(default=False)
+    scheduled: bool = attr.ib(default=True)
+
+
+class _PointInTimeScheduler:
+    """Fire point in time listeners from a single time_changed listener.
+
+    Pending timers are kept in a heap ordered by their point in time, so each
+    time_changed event only looks at the timers that are due. Time is taken
+    from the time_changed events, so rolling back or jumping the clock behaves
+    the same as for any other time_changed listener.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._timers: List[Tuple[datetime, int, _PointInTimeTimer]] = []
+        self._counter = count()
+        self._cancelled = 0
+        self._unsub: Optional[CALLBACK_TYPE] = None
 
     @callback
-    def point_in_time_listener(event: Event) -> None:
-        """Listen for matching time_changed events."""
+    def async_schedule(
+        self, action: Callable[..., Any], point_in_time: datetime
+    ) -> CALLBACK_TYPE:
+        """Schedule an action to run at a specific point in UTC time."""
+        timer = _PointInTimeTimer(action)
+        heapq.heappush(self._timers, (point_in_time, next(self._counter), timer))
+
+        if self._unsub is None:
+            self._unsub = self.hass.bus.async_listen(
+                EVENT_TIME_CHANGED, self._async_time_changed
+            )
+
+        @callback
+        def async_cancel() -> None:
+            """Cancel the timer."""
+            if timer.cancelled:
+                return
+
+            timer.cancelled = True
+
+            if timer.scheduled:
+                self._cancelled += 1
+                self._async_cleanup()
+
+        return async_cancel
+
+    @callback
+    def _async_time_changed(self, event: Event) -> None:
+        """Run the timers that are due."""
         now = event.data[ATTR_NOW]
+        due = []
 
-        if now < point_in_time or hasattr(point_in_time_listener, "run"):
-            return
+        while self._timers and self._timers[0][0] <= now:
+            timer = heapq.heappop(self._timers)[2]
+            timer.scheduled = False
 
-        # Set variable so that we will never run twice.
-        # Because the event bus might have to wait till a thread comes
-        # available to execute this listener it might occur that the
-        # listener gets lined up twice to be executed. This will make
-        # sure the second time it does nothing.
-        setattr(point_in_time_listener, "run", True)
-        async_unsub()
+            if timer.cancelled:
+                self._cancelled -= 1
+            else:
+                due.append(timer)
 
-        hass.async_run_job(action, now)
+        self._async_cleanup()
+
+        for timer in due:
+            # A timer that ran earlier in this loop may have cancelled it
+            if timer.cancelled:
+                continue
 
-    async_unsub = hass.bus.async_listen(EVENT_TIME_CHANGED, point_in_time_listener)
+            timer.cancelled = True
 
-    return async_unsub
+            try:
+                self.hass.async_run_job(timer.action, now)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running point in time listener")
+
+    @callback
+    def _async_cleanup(self) -> None:
+        """Drop cancelled timers and stop listening when nothing is pending."""
+        if self._cancelled == len(self._timers):
+            self._timers.clear()
+            self._cancelled = 0
+        elif self._cancelled > len(self._timers) // 2:
+            self._timers = [entry for entry in self._timers if not entry[2].cancelled]
+            heapq.heapify(self._timers)
+            self._cancelled = 0
+
+        if not self._timers and self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+
+@callback
+@bind_hass
+def async_track_point_in_utc_time(
+    hass: HomeAssistant, action: Callable[..., Any], point_in_time: datetime
+) -> CALLBACK_TYPE:
+    """Add a listener that fires once after a specific point in UTC time."""
+    scheduler = hass.data.get(TRACK_POINT_IN_TIME_SCHEDULER)
+
+    if scheduler is None:
+        scheduler = hass.data[TRACK_POINT_IN_TIME_SCHEDULER] = _PointInTimeScheduler(
+            hass
+        )
+
+    # Ensure point_in_time is UTC
+    return cast(_PointInTimeScheduler, scheduler).async_schedule(
+        action, dt_util.as_utc(point_in_time)
+    )
 
 
 track_point_in_utc_time = threaded_listener_factory(async_track_point_in_utc_time)
@@ -390,6 +541,181 @@ def async_track_sunset(
 track_sunset = threaded_listener_factory(async_track_sunset)
 
 
+def _parse_time_expression(parameter: Any, min_value: int, max_value: int) -> List[int]:
+    """Parse a time expression, sharing the result between identical patterns."""
+    if isinstance(parameter, list):
+        parameter = tuple(parameter)
+
+    return _parse_time_expression_cached(parameter, min_value, max_value)
+
+
+@ft.lru_cache(maxsize=256)
+def _parse_time_expression_cached(
+    parameter: Any, min_value: int, max_value: int
+) -> List[int]:
+    """Parse a hashable time expression."""
+    return dt_util.parse_time_expression(parameter, min_value, max_value)
+
+
+@attr.s(slots=True)
+class _TimePatternListener:
+    """A time pattern listener and the next time it should fire."""
+
+    action: Callable[..., Any] = attr.ib()
+    seconds: List[int] = attr.ib()
+    minutes: List[int] = attr.ib()
+    hours: List[int] = attr.ib()
+    local: bool = attr.ib()
+    next_time: Optional[datetime] = attr.ib(default=None)
+    cancelled: bool = attr.ib(default=False)
+    scheduled: bool = attr.ib(default=False)
+
+    def calculate_next(self, now: datetime) -> None:
+        """Calculate and set the next time the listener should fire."""
+        localized_now = dt_util.as_local(now) if self.local else now
+        self.next_time = dt_util.find_next_time_expression_time(
+            localized_now, self.seconds, self.minutes, self.hours
+        )
+
+
+class _TimePatternScheduler:
+    """Fire time pattern listeners from a single time_changed listener.
+
+    Each listener is queued by the next time its pattern matches, so a
+    time_changed event only runs the listeners that are due. The next time is
+    calculated from the time_changed events and is recalculated for every
+    listener when the time rolls back.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._listeners: List[Tuple[datetime, int, _TimePatternListener]] = []
+        self._pending: List[Tuple[int, _TimePatternListener]] = []
+        self._counter = count()
+        self._cancelled = 0
+        self._last_now: Optional[datetime] = None
+        self._unsub: Optional[CALLBACK_TYPE] = None
+
+    @callback
+    def async_add(self, listener: _TimePatternListener) -> CALLBACK_TYPE:
+        """Add a time pattern listener.
+
+        The next time is calculated when the next time_changed event arrives.
+        """
+        pending = (next(self._counter), listener)
+        self._pending.append(pending)
+
+        if self._unsub is None:
+            self._unsub = self.hass.bus.async_listen(
+                EVENT_TIME_CHANGED, self._async_time_changed
+            )
+
+        @callback
+        def async_remove() -> None:
+            """Remove the time pattern listener."""
+            if listener.cancelled:
+                return
+
+            listener.cancelled = True
+
+            if listener.scheduled:
+                self._cancelled += 1
+            elif pending in self._pending:
+                self._pending.remove(pending)
+
+            self._async_cleanup()
+
+        return async_remove
+
+    @callback
+    def _async_time_changed(self, event: Event) -> None:
+        """Run the listeners that are due."""
+        now = event.data[ATTR_NOW]
+
+        if self._last_now is not None and now < self._last_now:
+            # Time rolled back, the queued next times are no longer valid
+            self._async_reschedule(now)
+
+        self._last_now = now
+
+        for seq, listener in self._pending:
+            listener.calculate_next(now)
+            self._async_push(seq, listener)
+
+        self._pending.clear()
+
+        due = []
+
+        while self._listeners and self._listeners[0][0] <= now:
+            _, seq, listener = heapq.heappop(self._listeners)
+            listener.scheduled = False
+
+            if listener.cancelled:
+                self._cancelled -= 1
+            else:
+                due.append((seq, listener))
+
+        for seq, listener in due:
+            # A listener that ran earlier in this loop may have removed it
+            if listener.cancelled:
+                continue
+
+            try:
+                self.hass.async_run_job(
+                    listener.action, dt_util.as_local(now) if listener.local else now
+                )
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running time pattern listener")
+
+            if not listener.cancelled:
+                listener.calculate_next(now + timedelta(seconds=1))
+                self._async_push(seq, listener)
+
+        self._async_cleanup()
+
+    @callback
+    def _async_push(self, seq: int, listener: _TimePatternListener) -> None:
+        """Queue a listener by its next time."""
+        heapq.heappush(
+            self._listeners, (cast(datetime, listener.next_time), seq, listener)
+        )
+        listener.scheduled = True
+
+    @callback
+    def _async_reschedule(self, now: datetime) -> None:
+        """Recalculate the next time of every queued listener."""
+        queued = [
+            (seq, listener)
+            for _, seq, listener in self._listeners
+            if not listener.cancelled
+        ]
+        self._listeners = []
+        self._cancelled = 0
+
+        for seq, listener in queued:
+            listener.calculate_next(now)
+            self._async_push(seq, listener)
+
+    @callback
+    def _async_cleanup(self) -> None:
+        """Drop removed listeners and stop listening when none are left."""
+        if self._cancelled == len(self._listeners):
+            self._listeners.clear()
+            self._cancelled = 0
+        elif self._cancelled > len(self._listeners) // 2:
+            self._listeners = [
+                entry for entry in self._listeners if not entry[2].cancelled
+            ]
+            heapq.heapify(self._listeners)
+            self._cancelled = 0
+
+        if not self._listeners and not self._pending and self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+            self._last_now = None
+
+
 @callback
 @bind_hass
 def async_track_utc_time_change(
@@ -412,46 +738,22 @@ def async_track_utc_time_change(
 
         return hass.bus.async_listen(EVENT_TIME_CHANGED, time_change_listener)
 
-    matching_seconds = dt_util.parse_time_expression(second, 0, 59)
-    matching_minutes = dt_util.parse_time_expression(minute, 0, 59)
-    matching_hours = dt_util.parse_time_expression(hour, 0, 23)
-
-    next_time = None
+    listener = _TimePatternListener(
+        action,
+        _parse_time_expression(second, 0, 59),
+        _parse_time_expression(minute, 0, 59),
+        _parse_time_expression(hour, 0, 23),
+        local,
+    )
 
-    def calculate_next(now: datetime) -> None:
-        """Calculate and set the next time the trigger should fire."""
-        nonlocal next_time
+    scheduler = hass.data.get(TRACK_TIME_PATTERN_SCHEDULER)
 
-        localized_now = dt_util.as_local(now) if local else now
-        next_time = dt_util.find_next_time_expression_time(
-            localized_now, matching_seconds, matching_minutes, matching_hours
+    if scheduler is None:
+        scheduler = hass.data[TRACK_TIME_PATTERN_SCHEDULER] = _TimePatternScheduler(
+            hass
         )
 
-    # Make sure rolling back the clock doesn't prevent the timer from
-    # triggering.
-    last_now: Optional[datetime] = None
-
-    @callback
-    def pattern_time_change_listener(event: Event) -> None:
-        """Listen for matching time_changed events."""
-        nonlocal next_time, last_now
-
-        now = event.data[ATTR_NOW]
-
-        if last_now is None or now < last_now:
-            # Time rolled back or next time not yet calculated
-            calculate_next(now)
-
-        last_now = now
-
-        if next_time <= now:
-            hass.async_run_job(action, dt_util.as_local(now) if local else now)
-            calculate_next(now + timedelta(seconds=1))
-
-    # We can't use async_track_point_in_utc_time here because it would
-    # break in the case that the system time abruptly jumps backwards.
-    # Our custom last_now logic takes care of resolving that scenario.
-    return hass.bus.async_listen(EVENT_TIME_CHANGED, pattern_time_change_listener)
+    return cast(_TimePatternScheduler, scheduler).async_add(listener)
 
 
 track_utc_time_change = threaded_listener_factory(async_track_utc_time_change)
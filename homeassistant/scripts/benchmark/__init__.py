@@ -2,8 +2,9 @@
 import argparse
 import asyncio
 from contextlib import suppress
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
+import tempfile
 from timeit import default_timer as timer
 from typing import Callable, Dict, TypeVar
 
@@ -108,6 +109,82 @@ async def time_changed_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def pending_timers_time_changed(hass):
+    """Run 100k time changed events with 10k pending point in time timers."""
+    count = 0
+    event = asyncio.Event()
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == 10 ** 5:
+            event.set()
+
+    @core.callback
+    def timer_action(_):
+        """Handle timer."""
+
+    now = datetime(2017, 10, 10, 15, 0, 0, tzinfo=dt_util.UTC)
+
+    for idx in range(10 ** 4):
+        hass.helpers.event.async_track_point_in_utc_time(
+            timer_action, now + timedelta(hours=1, seconds=idx)
+        )
+
+    hass.bus.async_listen(EVENT_TIME_CHANGED, listener)
+    event_data = {ATTR_NOW: now}
+
+    for _ in range(10 ** 5):
+        hass.bus.async_fire(EVENT_TIME_CHANGED, event_data)
+
+    start = timer()
+
+    await event.wait()
+
+    return timer() - start
+
+
+@benchmark
+async def idle_time_patterns_time_changed(hass):
+    """Run 100k time changed events with 1000 idle time patterns."""
+    count = 0
+    event = asyncio.Event()
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == 10 ** 5:
+            event.set()
+
+    @core.callback
+    def pattern_action(_):
+        """Handle time pattern."""
+
+    for _ in range(1000):
+        hass.helpers.event.async_track_utc_time_change(
+            pattern_action, minute="/5", second=0
+        )
+
+    hass.bus.async_listen(EVENT_TIME_CHANGED, listener)
+    event_data = {ATTR_NOW: datetime(2017, 10, 10, 15, 1, 30, tzinfo=dt_util.UTC)}
+
+    for _ in range(10 ** 5):
+        hass.bus.async_fire(EVENT_TIME_CHANGED, event_data)
+
+    start = timer()
+
+    await event.wait()
+
+    return timer() - start
+
+
 @benchmark
 async def state_changed_helper(hass):
     """Run a million events through state changed helper."""
@@ -141,6 +218,114 @@ async def state_changed_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def state_changed_trackers_10(hass):
+    """Dispatch state changes with 10 entity trackers."""
+    return await _state_changed_trackers(hass, 10)
+
+
+@benchmark
+async def state_changed_trackers_100(hass):
+    """Dispatch state changes with 100 entity trackers."""
+    return await _state_changed_trackers(hass, 100)
+
+
+@benchmark
+async def state_changed_trackers_1000(hass):
+    """Dispatch state changes with 1000 entity trackers."""
+    return await _state_changed_trackers(hass, 1000)
+
+
+async def _state_changed_trackers(hass, tracker_count):
+    """Run 100k state changes of one entity with many entities tracked."""
+    count = 0
+    entity_id = "light.kitchen"
+    event = asyncio.Event()
+
+    @core.callback
+    def listener(*args):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == 10 ** 5:
+            event.set()
+
+    @core.callback
+    def other_listener(*args):
+        """Handle event for other entities."""
+
+    for idx in range(tracker_count):
+        hass.helpers.event.async_track_state_change(
+            f"light.tracked_{idx}", other_listener
+        )
+
+    hass.helpers.event.async_track_state_change(entity_id, listener)
+    event_data = {
+        "entity_id": entity_id,
+        "old_state": core.State(entity_id, "off"),
+        "new_state": core.State(entity_id, "on"),
+    }
+
+    for _ in range(10 ** 5):
+        hass.bus.async_fire(EVENT_STATE_CHANGED, event_data)
+
+    start = timer()
+
+    await event.wait()
+
+    return timer() - start
+
+
+@benchmark
+async def websocket_state_changed_fan_out(hass):
+    """Forward 10k state changes to 50 websocket subscriptions."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.auth.models import User
+    from homeassistant.components.websocket_api import commands, connection
+
+    connection_count = 50
+    expected = connection_count * (10 ** 4 + 1)
+    count = 0
+    entity_id = "light.kitchen"
+    event = asyncio.Event()
+    user = User(name="Benchmark", perm_lookup=None, is_owner=True, is_active=True)
+
+    def send_message(message):
+        """Serialize message like the websocket writer."""
+        nonlocal count
+        if not isinstance(message, str):
+            message = JSON_DUMP(message)
+        count += 1
+
+        if count == expected:
+            event.set()
+
+    for _ in range(connection_count):
+        commands.handle_subscribe_events(
+            hass,
+            connection.ActiveConnection(
+                logging.getLogger(__name__), hass, send_message, user, None
+            ),
+            {"id": 1, "type": "subscribe_events", "event_type": EVENT_STATE_CHANGED},
+        )
+
+    event_data = {
+        "entity_id": entity_id,
+        "old_state": core.State(entity_id, "off", {"friendly_name": "Kitchen"}),
+        "new_state": core.State(entity_id, "on", {"friendly_name": "Kitchen"}),
+    }
+
+    for _ in range(10 ** 4):
+        hass.bus.async_fire(EVENT_STATE_CHANGED, event_data)
+
+    start = timer()
+
+    await event.wait()
+
+    return timer() - start
+
+
 @benchmark
 async def logbook_filtering_state(hass):
     """Filter state changes."""
@@ -188,6 +373,64 @@ async def _logbook_filtering(hass, last_changed, last_updated):
     return timer() - start
 
 
+@benchmark
+async def recorder_write_sqlite_memory(hass):
+    """Record 10k state changes to an in-memory SQLite database."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        return await _recorder_write(hass, tmpdir, "sqlite://")
+
+
+@benchmark
+async def recorder_write_sqlite_file(hass):
+    """Record 10k state changes to an SQLite database on disk.
+
+    Stands in for a database server, the commit has to reach the disk.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        return await _recorder_write(hass, tmpdir, f"sqlite:///{tmpdir}/benchmark.db")
+
+
+async def _recorder_write(hass, config_dir, db_url):
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components import recorder
+
+    event_count = 10 ** 4
+    hass.config.config_dir = config_dir
+    hass.state = core.CoreState.running
+    # Commit every write, the worst case for the database
+    instance = recorder.Recorder(
+        hass,
+        keep_days=0,
+        purge_interval=0,
+        commit_interval=0,
+        uri=db_url,
+        db_max_retries=1,
+        db_retry_wait=0,
+        include={},
+        exclude={},
+    )
+    instance.async_initialize()
+    instance.start()
+    await instance.async_db_ready
+
+    start = timer()
+
+    for idx in range(event_count):
+        hass.states.async_set(
+            f"sensor.benchmark_{idx % 100}", idx, {"unit_of_measurement": "W"}
+        )
+    # Let the event listeners queue the events before waiting on the queue
+    await asyncio.sleep(0)
+    await hass.async_add_executor_job(instance.block_till_done)
+
+    runtime = timer() - start
+    print(f"Recorded {event_count / runtime:.0f} events/s")
+
+    instance.queue.put(None)
+    await hass.async_add_executor_job(instance.join)
+    return runtime
+
+
 @benchmark
 async def valid_entity_id(hass):
     """Run valid entity ID a million times."""
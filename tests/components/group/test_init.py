@@ -15,12 +15,24 @@ from homeassistant.const import (
     STATE_ON,
     STATE_UNKNOWN,
 )
+from homeassistant.helpers.event import TRACK_STATE_CHANGE_CALLBACKS
 from homeassistant.setup import async_setup_component, setup_component
 
 from tests.common import assert_setup_component, get_test_home_assistant
 from tests.components.group import common
 
 
+def _tracked_state_listener_count(hass):
+    """Return the number of unique state change trackers."""
+    return len(
+        {
+            listener
+            for listeners in hass.data[TRACK_STATE_CHANGE_CALLBACKS].values()
+            for listener in listeners
+        }
+    )
+
+
 class TestComponentsGroup(unittest.TestCase):
     """Test Group component."""
 
@@ -394,7 +406,8 @@ class TestComponentsGroup(unittest.TestCase):
             "group.second_group",
             "group.test_group",
         ]
-        assert self.hass.bus.listeners["state_changed"] == 3
+        assert self.hass.bus.listeners["state_changed"] == 1
+        assert _tracked_state_listener_count(self.hass) == 3
 
         with patch(
             "homeassistant.config.load_yaml_config_file",
@@ -409,7 +422,8 @@ class TestComponentsGroup(unittest.TestCase):
             "group.all_tests",
             "group.hello",
         ]
-        assert self.hass.bus.listeners["state_changed"] == 2
+        assert self.hass.bus.listeners["state_changed"] == 1
+        assert _tracked_state_listener_count(self.hass) == 2
 
     def test_modify_group(self):
         """Test modifying a group."""
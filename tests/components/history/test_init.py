@@ -192,6 +192,36 @@ class TestComponentHistory(unittest.TestCase):
         )
         assert states == hist
 
+    def test_get_significant_states_columnar(self):
+        """Test the columnar result holds the same significant states."""
+        zero, four, _ = self.record_states()
+        hist = history.get_significant_states(
+            self.hass, zero, four, filters=history.Filters()
+        )
+        columnar = history.get_significant_states_columnar(
+            self.hass, zero, four, filters=history.Filters()
+        )
+
+        assert list(columnar) == list(hist)
+        for entity_id, states in hist.items():
+            columns = columnar[entity_id]
+            assert columns["state"] == [state.state for state in states]
+            assert columns["last_changed"] == [
+                state.last_changed.timestamp() for state in states
+            ]
+            assert columns["attributes"] == dict(
+                self.hass.states.get(entity_id).attributes
+            )
+
+        therm = columnar["thermostat.test"]
+        assert therm["last_updated"] == [
+            state.last_updated.timestamp() for state in hist["thermostat.test"]
+        ]
+        assert therm["attributes_history"] == [
+            dict(state.attributes) for state in hist["thermostat.test"]
+        ]
+        assert "attributes_history" not in columnar["media_player.test"]
+
     def test_get_significant_states_with_initial(self):
         """Test that only significant states are returned.
 
@@ -701,3 +731,22 @@ async def test_fetch_period_api_with_include_order(hass, hass_client):
         params={"filter_entity_id": "non.existing,something.else"},
     )
     assert response.status == 200
+
+
+async def test_fetch_period_api_columnar(hass, hass_client):
+    """Test the fetch period view returns columns per entity."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    hass.states.async_set("sensor.power", "10", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{(dt_util.utcnow() - timedelta(hours=1)).isoformat()}",
+        params={"filter_entity_id": "sensor.power", "columnar": ""},
+    )
+    assert response.status == 200
+    result = await response.json()
+    assert list(result) == ["sensor.power"]
+    assert result["sensor.power"]["state"] == ["10"]
+    assert result["sensor.power"]["attributes"] == {"unit_of_measurement": "W"}
@@ -1,4 +1,5 @@
 """The tests for the MQTT component."""
+import asyncio
 from datetime import timedelta
 import json
 import ssl
@@ -617,6 +618,35 @@ class TestMQTTCallbacks(unittest.TestCase):
         self.hass.block_till_done()
         assert calls_b.called
 
+    def test_subscribe_overlapping_topic_filters(self):
+        """Test every matching topic filter receives the message once."""
+        unsubs = [
+            mqtt.subscribe(self.hass, "test-topic/#", self.record_calls),
+            mqtt.subscribe(self.hass, "test-topic/+/on", self.record_calls),
+            mqtt.subscribe(self.hass, "test-topic/bier/on", self.record_calls),
+            mqtt.subscribe(self.hass, "test-topic/bier/off", self.record_calls),
+        ]
+
+        fire_mqtt_message(self.hass, "test-topic/bier/on", "test-payload")
+
+        self.hass.block_till_done()
+        assert sorted(call[0].subscribed_topic for call in self.calls) == [
+            "test-topic/#",
+            "test-topic/+/on",
+            "test-topic/bier/on",
+        ]
+
+        for unsub in unsubs:
+            unsub()
+
+        fire_mqtt_message(self.hass, "test-topic/bier/on", "test-payload")
+
+        self.hass.block_till_done()
+        assert len(self.calls) == 3
+        assert not list(
+            self.hass.data["mqtt"]._matcher.iter_match("test-topic/bier/on")
+        )
+
     def test_not_calling_unsubscribe_with_active_subscribers(self):
         """Test not calling unsubscribe() when other subscribers are active."""
         unsub = mqtt.subscribe(self.hass, "test/state", None)
@@ -885,6 +915,78 @@ async def test_mqtt_ws_subscription(hass, hass_ws_client):
     assert response["success"]
 
 
+async def test_messages_handed_over_in_batches(hass):
+    """Test messages from the paho thread are handled in batches."""
+    await async_mock_mqtt_client(
+        hass, {mqtt.CONF_BROKER: "mock-broker", mqtt.CONF_MESSAGE_BATCH_SIZE: 2}
+    )
+    mqtt_client = hass.data["mqtt"]
+    calls = []
+
+    await mqtt.async_subscribe(hass, "test-topic", calls.append)
+
+    with mock.patch.object(
+        hass.loop, "call_soon_threadsafe", wraps=hass.loop.call_soon_threadsafe
+    ) as mock_call_soon_threadsafe:
+        for idx in range(5):
+            mqtt_client._mqtt_on_message(
+                None, None, mqtt.Message("test-topic", str(idx).encode(), 0, False)
+            )
+
+    assert mock_call_soon_threadsafe.call_count == 1
+
+    for _ in range(3):
+        await asyncio.sleep(0)
+    await hass.async_block_till_done()
+
+    assert [call.payload for call in calls] == ["0", "1", "2", "3", "4"]
+
+    stats = mqtt_client.message_stats
+    assert stats.messages == 5
+    assert stats.batches == 3
+    assert stats.max_batch_size == 2
+    assert stats.last_batch_size == 1
+
+
+async def test_messages_wait_for_batch_latency(hass):
+    """Test messages wait up to the batch latency before being handled."""
+    await async_mock_mqtt_client(
+        hass, {mqtt.CONF_BROKER: "mock-broker", mqtt.CONF_MESSAGE_BATCH_LATENCY: 0.01}
+    )
+    mqtt_client = hass.data["mqtt"]
+    calls = []
+
+    await mqtt.async_subscribe(hass, "test-topic", calls.append)
+
+    mqtt_client._mqtt_on_message(
+        None, None, mqtt.Message("test-topic", b"test1", 0, False)
+    )
+    await hass.async_block_till_done()
+    assert len(calls) == 0
+
+    mqtt_client._mqtt_on_message(
+        None, None, mqtt.Message("test-topic", b"test2", 0, False)
+    )
+    await asyncio.sleep(0.05)
+    await hass.async_block_till_done()
+
+    assert [call.payload for call in calls] == ["test1", "test2"]
+    assert mqtt_client.message_stats.batches == 1
+    assert mqtt_client.message_stats.last_queue_delay > 0
+
+
+async def test_message_stats_websocket(hass, hass_ws_client):
+    """Test getting the message counters over the websocket API."""
+    await async_mock_mqtt_client(hass)
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 5, "type": "mqtt/message_stats"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["messages"] == 0
+    assert response["result"]["batches"] == 0
+
+
 async def test_dump_service(hass):
     """Test that we can dump a topic."""
     await async_mock_mqtt_component(hass)
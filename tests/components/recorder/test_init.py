@@ -9,8 +9,8 @@ from homeassistant.components.recorder import Recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.models import Events, States
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.const import MATCH_ALL
-from homeassistant.core import callback
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL
+from homeassistant.core import Event, State, callback
 from homeassistant.setup import async_setup_component
 
 from .common import wait_recording_done
@@ -188,6 +188,34 @@ def test_saving_state_include_domain_exclude_entity(hass_recorder):
     assert hass.states.get("test.ok").state == "state2"
 
 
+def test_saving_states_in_batches(hass_recorder):
+    """Test states are linked to their events when written in batches."""
+    hass = hass_recorder()
+    entity_ids = [f"test.batch_{idx}" for idx in range(5)]
+
+    with patch("homeassistant.components.recorder.MAX_BATCH_SIZE", 2):
+        for entity_id in entity_ids:
+            hass.states.set(entity_id, "on", {"entity": entity_id})
+        hass.bus.fire("test_event")
+        wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        events = {
+            event.event_id: event.to_native()
+            for event in session.query(Events).filter(
+                Events.event_type.in_(["state_changed", "test_event"])
+            )
+        }
+        states = list(session.query(States))
+
+        assert len(events) == 6
+        assert sorted(state.entity_id for state in states) == entity_ids
+        for state in states:
+            event = events[state.event_id]
+            assert event.data["entity_id"] == state.entity_id
+            assert event.data["new_state"]["attributes"] == {"entity": state.entity_id}
+
+
 def test_recorder_setup_failure():
     """Test some exceptions."""
     hass = get_test_home_assistant()
@@ -213,6 +241,105 @@ def test_recorder_setup_failure():
     hass.stop()
 
 
+def _queue_overflow_recorder(hass, queue_overflow):
+    """Return a recorder with room for two events in the queue."""
+    return Recorder(
+        hass,
+        keep_days=7,
+        purge_interval=2,
+        commit_interval=1,
+        uri="sqlite://",
+        db_max_retries=10,
+        db_retry_wait=3,
+        include={},
+        exclude={},
+        queue_max_size=2,
+        queue_overflow=queue_overflow,
+    )
+
+
+def _state_changed_event(entity_id, state):
+    """Return a state changed event."""
+    return Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": entity_id, "new_state": State(entity_id, state)},
+    )
+
+
+def test_queue_overflow_coalesce():
+    """Test only the latest state of an entity is kept when the queue is full."""
+    hass = get_test_home_assistant()
+    rec = _queue_overflow_recorder(hass, "coalesce")
+
+    for event in (
+        _state_changed_event("test.first", "1"),
+        _state_changed_event("test.second", "1"),
+        _state_changed_event("test.first", "2"),
+        _state_changed_event("test.first", "3"),
+        Event(EVENT_TIME_CHANGED),
+        Event("test_event"),
+    ):
+        rec.event_listener(event)
+
+    assert rec.queue.qsize() == 2
+    assert rec.queue_stats.as_dict(rec.queue.qsize()) == {
+        "queue_size": 2,
+        "max_queue_size": 2,
+        "dropped": 2,
+        "coalesced": 1,
+        "last_queue_delay": 0,
+        "max_queue_delay": 0,
+    }
+
+    rec.queue.get()
+    rec._requeue_overflow()
+    rec.queue.get()
+    event = rec.queue.get()
+    assert event.data["new_state"].state == "3"
+    assert rec.queue.empty()
+
+    # A new state for the entity goes straight into the queue again
+    rec.event_listener(_state_changed_event("test.first", "4"))
+    assert rec.queue.get().data["new_state"].state == "4"
+
+    hass.stop()
+
+
+def test_queue_overflow_drop():
+    """Test events are dropped when the queue is full."""
+    hass = get_test_home_assistant()
+    rec = _queue_overflow_recorder(hass, "drop")
+
+    for state in ("1", "2", "3", "4"):
+        rec.event_listener(_state_changed_event("test.first", state))
+
+    assert rec.queue.qsize() == 2
+    assert rec.queue_stats.dropped == 2
+    assert rec.queue_stats.coalesced == 0
+
+    hass.stop()
+
+
+async def test_queue_stats_websocket(hass, hass_ws_client):
+    """Test getting the queue counters over the websocket API."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    client = await hass_ws_client(hass)
+
+    await client.send_json({"id": 5, "type": "recorder/queue_stats"})
+    msg = await client.receive_json()
+
+    assert msg["success"]
+    assert set(msg["result"]) == {
+        "queue_size",
+        "max_queue_size",
+        "dropped",
+        "coalesced",
+        "last_queue_delay",
+        "max_queue_delay",
+    }
+    assert msg["result"]["dropped"] == 0
+
+
 async def test_defaults_set(hass):
     """Test the config defaults are set."""
     recorder_config = None
@@ -121,6 +121,38 @@ class TestRecorderPurge(unittest.TestCase):
             # we should only have 2 events left
             assert events.count() == 2
 
+    def test_purge_old_states_in_batches(self):
+        """Test old states are deleted in batches."""
+        self._add_test_states()
+
+        with session_scope(hass=self.hass) as session, patch(
+            "homeassistant.components.recorder.purge.PURGE_BATCH_SIZE", 3
+        ):
+            states = session.query(States)
+
+            assert not purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+            assert states.count() == 3
+            assert states.filter(States.state == "autopurgeme").count() == 0
+
+            assert purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+            assert states.count() == 2
+
+    def test_purge_method_in_batches(self):
+        """Test the purge service continues until all old rows are deleted."""
+        self._add_test_events()
+        self._add_test_states()
+
+        with session_scope(hass=self.hass) as session, patch(
+            "homeassistant.components.recorder.purge.PURGE_BATCH_SIZE", 1
+        ):
+            self.hass.services.call("recorder", "purge", service_data={"keep_days": 4})
+            self.hass.block_till_done()
+            self.hass.data[DATA_INSTANCE].block_till_done()
+
+            assert session.query(States).count() == 2
+            events = session.query(Events).filter(Events.event_type.like("EVENT_TEST%"))
+            assert events.count() == 2
+
     def test_purge_method(self):
         """Test purge method."""
         service_data = {"keep_days": 4}
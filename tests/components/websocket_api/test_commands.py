@@ -1,7 +1,10 @@
 """Tests for WebSocket API commands."""
+import asyncio
+from unittest.mock import patch
+
 from async_timeout import timeout
 
-from homeassistant.components.websocket_api import const
+from homeassistant.components.websocket_api import const, messages
 from homeassistant.components.websocket_api.auth import (
     TYPE_AUTH,
     TYPE_AUTH_OK,
@@ -387,6 +390,135 @@ async def test_subscribe_unsubscribe_events_state_changed(
     assert msg["event"]["data"]["entity_id"] == "light.permitted"
 
 
+async def test_state_changed_serialized_once(hass, websocket_client):
+    """Test a state_changed event is serialized once for all subscriptions."""
+    for iden in (5, 6):
+        await websocket_client.send_json(
+            {"id": iden, "type": "subscribe_events", "event_type": "state_changed"}
+        )
+        msg = await websocket_client.receive_json()
+        assert msg["success"]
+
+    with patch.object(
+        messages.const, "JSON_DUMP", wraps=messages.const.JSON_DUMP
+    ) as mock_dump:
+        hass.states.async_set("light.kitchen", "on", {"__IDEN__": "__IDEN__"})
+
+        for iden in (5, 6):
+            msg = await websocket_client.receive_json()
+            assert msg["id"] == iden
+            assert msg["type"] == "event"
+            assert msg["event"]["data"]["entity_id"] == "light.kitchen"
+            assert msg["event"]["data"]["new_state"]["attributes"] == {
+                "__IDEN__": "__IDEN__"
+            }
+
+    assert mock_dump.call_count == 1
+
+
+async def test_subscribe_entities(hass, websocket_client, hass_admin_user):
+    """Test subscribing to changed fields of selected entities."""
+    hass_admin_user.groups = []
+    hass_admin_user.mock_policy(
+        {"entities": {"domains": {"light": True, "sensor": True}}}
+    )
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100, "color": "red"})
+    hass.states.async_set("sensor.other", "10")
+    hass.states.async_set("switch.not_permitted", "on")
+
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "subscribe_entities",
+            "entity_ids": ["light.kitchen", "switch.not_permitted"],
+        }
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["type"] == "event"
+    assert list(msg["event"]["changed"]) == ["light.kitchen"]
+    assert msg["event"]["changed"]["light.kitchen"]["state"] == "on"
+    assert msg["event"]["changed"]["light.kitchen"]["attributes"] == {
+        "brightness": 100,
+        "color": "red",
+    }
+
+    hass.states.async_set("sensor.other", "11")
+    hass.states.async_set("switch.not_permitted", "off")
+    hass.states.async_set("light.kitchen", "on", {"brightness": 150})
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "changed": {
+            "light.kitchen": {
+                "attributes": {"brightness": 150},
+                "removed_attributes": ["color"],
+            }
+        },
+        "removed": [],
+    }
+
+    hass.states.async_remove("light.kitchen")
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"changed": {}, "removed": ["light.kitchen"]}
+
+
+async def test_subscribe_entities_domains_coalesce(hass, websocket_client):
+    """Test changes of subscribed domains are coalesced."""
+    hass.states.async_set("light.kitchen", "off")
+
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "subscribe_entities",
+            "domains": ["light"],
+            "coalesce_window": 0.05,
+        }
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["changed"]["light.kitchen"]["state"] == "off"
+
+    hass.states.async_set("light.kitchen", "on", {"brightness": 50})
+    hass.states.async_set("switch.ignored", "on")
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100})
+    hass.states.async_set("light.hallway", "on")
+    await asyncio.sleep(0)
+
+    msg = await websocket_client.receive_json()
+    changed = msg["event"]["changed"]
+    assert list(changed) == ["light.kitchen", "light.hallway"]
+    assert changed["light.kitchen"]["state"] == "on"
+    assert changed["light.kitchen"]["attributes"] == {"brightness": 100}
+    assert "last_changed" in changed["light.kitchen"]
+    assert changed["light.hallway"]["state"] == "on"
+
+    await websocket_client.send_json(
+        {"id": 6, "type": "unsubscribe_events", "subscription": 5}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["success"]
+
+
+async def test_subscribe_entities_requires_filter(websocket_client):
+    """Test subscribing to entities requires entity_ids or domains."""
+    await websocket_client.send_json({"id": 5, "type": "subscribe_entities"})
+
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_INVALID_FORMAT
+
+
 async def test_render_template_renders_template(
     hass, websocket_client, hass_admin_user
 ):
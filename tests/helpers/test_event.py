@@ -7,10 +7,13 @@ from astral import Astral
 import pytest
 
 from homeassistant.components import sun
-from homeassistant.const import MATCH_ALL
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL
 import homeassistant.core as ha
 from homeassistant.core import callback
 from homeassistant.helpers.event import (
+    TRACK_POINT_IN_TIME_SCHEDULER,
+    TRACK_STATE_CHANGE_CALLBACKS,
+    TRACK_TIME_PATTERN_SCHEDULER,
     async_call_later,
     async_track_point_in_time,
     async_track_point_in_utc_time,
@@ -85,6 +88,60 @@ async def test_track_point_in_time(hass):
     assert len(runs) == 2
 
 
+async def test_track_point_in_time_scheduler(hass):
+    """Test point in time trackers share one time changed listener."""
+    birthday_paulus = datetime(1986, 7, 9, 12, 0, 0, tzinfo=dt_util.UTC)
+    runs = []
+
+    init_count = hass.bus.async_listeners().get(EVENT_TIME_CHANGED, 0)
+
+    async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append(2)), birthday_paulus + timedelta(hours=1)
+    )
+    async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append(1)), birthday_paulus
+    )
+    unsubs = [
+        async_track_point_in_utc_time(
+            hass, callback(lambda x: runs.append(0)), birthday_paulus
+        )
+        for _ in range(10)
+    ]
+
+    assert hass.bus.async_listeners()[EVENT_TIME_CHANGED] == init_count + 1
+
+    for unsub in unsubs:
+        unsub()
+
+    # Cancelled timers are dropped from the heap
+    assert len(hass.data[TRACK_POINT_IN_TIME_SCHEDULER]._timers) == 2
+
+    _send_time_changed(hass, birthday_paulus + timedelta(hours=2))
+    await hass.async_block_till_done()
+    assert runs == [1, 2]
+    assert hass.bus.async_listeners().get(EVENT_TIME_CHANGED, 0) == init_count
+
+
+async def test_track_point_in_time_cancel_due(hass):
+    """Test a due timer cancelled by another due timer does not run."""
+    birthday_paulus = datetime(1986, 7, 9, 12, 0, 0, tzinfo=dt_util.UTC)
+    runs = []
+
+    @callback
+    def cancel_other(now):
+        runs.append(1)
+        unsub()
+
+    async_track_point_in_utc_time(hass, cancel_other, birthday_paulus)
+    unsub = async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append(2)), birthday_paulus
+    )
+
+    _send_time_changed(hass, birthday_paulus)
+    await hass.async_block_till_done()
+    assert runs == [1]
+
+
 async def test_track_state_change(hass):
     """Test track_state_change."""
     # 2 lists to track how often our callbacks get called
@@ -163,6 +220,74 @@ async def test_track_state_change(hass):
     assert len(wildercard_runs) == 6
 
 
+async def test_track_state_change_shared_index(hass):
+    """Test state change trackers share one indexed bus listener."""
+    runs = []
+    other_runs = []
+
+    @ha.callback
+    def run_callback(entity_id, old_state, new_state):
+        runs.append(entity_id)
+
+    @ha.callback
+    def other_run_callback(entity_id, old_state, new_state):
+        other_runs.append(entity_id)
+
+    init_count = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+
+    unsub = async_track_state_change(
+        hass, ["light.Bowl", "light.kitchen"], run_callback
+    )
+    unsub_other = async_track_state_change(hass, "switch.other", other_run_callback)
+
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == init_count + 1
+    assert set(hass.data[TRACK_STATE_CHANGE_CALLBACKS]) == {
+        "light.bowl",
+        "light.kitchen",
+        "switch.other",
+    }
+
+    hass.states.async_set("light.Bowl", "on")
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("switch.other", "on")
+    await hass.async_block_till_done()
+    assert runs == ["light.bowl", "light.kitchen"]
+    assert other_runs == ["switch.other"]
+
+    unsub()
+    assert set(hass.data[TRACK_STATE_CHANGE_CALLBACKS]) == {"switch.other"}
+
+    hass.states.async_set("light.Bowl", "off")
+    await hass.async_block_till_done()
+    assert len(runs) == 2
+
+    unsub_other()
+    assert hass.data[TRACK_STATE_CHANGE_CALLBACKS] == {}
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == init_count
+
+
+async def test_track_state_change_listener_error(hass, caplog):
+    """Test an error in one tracker does not affect other trackers."""
+    runs = []
+
+    @ha.callback
+    def failing_callback(entity_id, old_state, new_state):
+        raise ValueError
+
+    @ha.callback
+    def run_callback(entity_id, old_state, new_state):
+        runs.append(entity_id)
+
+    async_track_state_change(hass, "light.bowl", failing_callback)
+    async_track_state_change(hass, MATCH_ALL, run_callback)
+
+    hass.states.async_set("light.bowl", "on")
+    await hass.async_block_till_done()
+
+    assert runs == ["light.bowl"]
+    assert "Error while processing state changed for light.bowl" in caplog.text
+
+
 async def test_track_template(hass):
     """Test tracking template."""
     specific_runs = []
@@ -709,6 +834,69 @@ async def test_periodic_task_clock_rollback(hass):
     assert len(specific_runs) == 4
 
 
+async def test_periodic_task_shared_scheduler(hass):
+    """Test time pattern listeners only run when their pattern is due."""
+    minute_runs = []
+    hour_runs = []
+
+    init_count = hass.bus.async_listeners().get(EVENT_TIME_CHANGED, 0)
+
+    unsub_minute = async_track_utc_time_change(
+        hass, lambda x: minute_runs.append(x), minute="/5", second=0
+    )
+    unsub_hour = async_track_utc_time_change(
+        hass, lambda x: hour_runs.append(x), hour="/2", minute=0, second=0
+    )
+
+    assert hass.bus.async_listeners()[EVENT_TIME_CHANGED] == init_count + 1
+
+    _send_time_changed(hass, datetime(2014, 5, 24, 21, 55, 1))
+    await hass.async_block_till_done()
+    assert len(minute_runs) == 0
+    assert len(hour_runs) == 0
+
+    scheduler = hass.data[TRACK_TIME_PATTERN_SCHEDULER]
+    assert [entry[0] for entry in scheduler._listeners] == [
+        datetime(2014, 5, 24, 22, 0, 0),
+        datetime(2014, 5, 24, 22, 0, 0),
+    ]
+
+    _send_time_changed(hass, datetime(2014, 5, 24, 22, 0, 0))
+    await hass.async_block_till_done()
+    assert len(minute_runs) == 1
+    assert len(hour_runs) == 1
+
+    _send_time_changed(hass, datetime(2014, 5, 24, 22, 5, 0))
+    await hass.async_block_till_done()
+    assert len(minute_runs) == 2
+    assert len(hour_runs) == 1
+
+    # Rolling back the clock recalculates every listener
+    _send_time_changed(hass, datetime(2014, 5, 24, 20, 0, 0))
+    await hass.async_block_till_done()
+    assert len(minute_runs) == 3
+    assert len(hour_runs) == 2
+
+    unsub_minute()
+    unsub_hour()
+    assert hass.bus.async_listeners().get(EVENT_TIME_CHANGED, 0) == init_count
+
+
+async def test_periodic_task_shares_parsed_expression(hass):
+    """Test identical patterns share their parsed time expression."""
+    unsub = async_track_utc_time_change(hass, lambda x: None, minute="/5", second=0)
+    unsub2 = async_track_utc_time_change(hass, lambda x: None, minute="/5", second=0)
+
+    scheduler = hass.data[TRACK_TIME_PATTERN_SCHEDULER]
+    first, second = (listener for _, listener in scheduler._pending)
+    assert first.minutes is second.minutes
+    assert first.seconds is second.seconds
+
+    unsub()
+    unsub2()
+    assert not scheduler._pending
+
+
 async def test_periodic_task_duplicate_time(hass):
     """Test periodic tasks not triggering on duplicate time."""
     specific_runs = []
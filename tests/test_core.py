@@ -593,6 +593,27 @@ class TestStateMachine(unittest.TestCase):
         states = sorted(state.entity_id for state in self.states.all())
         assert ["light.bowl", "switch.ac"] == states
 
+    def test_all_domain_filter(self):
+        """Test getting all states of a domain."""
+        self.states.set("light.Kitchen", "off")
+
+        states = self.states.all("light")
+        assert [state.entity_id for state in states] == ["light.bowl", "light.kitchen"]
+        assert [state.entity_id for state in self.states.all("Switch")] == ["switch.ac"]
+        assert self.states.all("sensor") == []
+
+    def test_domain_index_updated(self):
+        """Test the domain index follows updates and removals."""
+        self.states.set("light.Bowl", "off")
+        assert [state.state for state in self.states.all("light")] == ["off"]
+
+        assert self.states.remove("switch.AC")
+        assert self.states.entity_ids("switch") == []
+        assert self.states.all("switch") == []
+
+        self.states.set("switch.AC", "on")
+        assert self.states.entity_ids("switch") == ["switch.ac"]
+
     def test_remove(self):
         """Test remove method."""
         events = []